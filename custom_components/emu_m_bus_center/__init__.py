@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 
@@ -10,9 +11,19 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 
-from .const import DOMAIN
+from .const import (
+    CONF_LIVENESS_CACHE_TTL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUESTS_PER_SECOND,
+    DEFAULT_LIVENESS_CACHE_TTL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DOMAIN,
+)
+from .coordinator import EmuCenterData
 from .device_types.devices import generic_sensor_deserializer
 from .emu_client import EmuApiClient
+from .store import EmuReadingsStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,24 +35,41 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
 
     hass.data.setdefault(DOMAIN, {})
 
-    client = EmuApiClient(ip=config_entry.data["ip"])
+    client = EmuApiClient(
+        ip=config_entry.data["ip"],
+        max_concurrent_requests=config_entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+        requests_per_second=config_entry.options.get(
+            CONF_REQUESTS_PER_SECOND, DEFAULT_REQUESTS_PER_SECOND
+        ),
+        liveness_ttl=config_entry.options.get(
+            CONF_LIVENESS_CACHE_TTL, DEFAULT_LIVENESS_CACHE_TTL
+        ),
+    )
     serialized_sensors = config_entry.data["sensors"]
     sensors_from_config = json.loads(
         serialized_sensors, object_hook=generic_sensor_deserializer
     )
 
-    connection_info = await client.validate_connection_async(
-        sensors=sensors_from_config
+    # The saved readings are loaded while the Center is checked, so the entities
+    # can show them as soon as they are created
+    store = EmuReadingsStore(hass, config_entry.entry_id)
+    connection_info, _ = await asyncio.gather(
+        client.validate_connection_async(sensors=sensors_from_config),
+        store.async_load(),
     )
 
     _LOGGER.debug("async_setup_entry got connectionInfo %s", connection_info)
 
     if not connection_info:
         _LOGGER.error("__init__ did not get the correct return dict")
+        await client.async_close()
         return False
 
     if not connection_info.get("found_center"):
         _LOGGER.error("__init__ did not find a center")
+        await client.async_close()
         raise ConfigEntryNotReady(
             "Could not communicate with M-Bus Center at %s", config_entry.data["ip"]
         )
@@ -49,9 +77,14 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     if not connection_info.get("found_all_sensors"):
         _LOGGER.error("__init__ did not find all sensors")
 
-    hass.data[DOMAIN][config_entry.entry_id] = client
+    hass.data[DOMAIN][config_entry.entry_id] = EmuCenterData(
+        client=client, store=store, options=dict(config_entry.options)
+    )
 
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    config_entry.async_on_unload(
+        config_entry.add_update_listener(_async_update_listener)
+    )
 
     return True
 
@@ -59,6 +92,25 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        center_data: EmuCenterData = hass.data[DOMAIN].pop(entry.entry_id)
+        await center_data.store.async_save()
+        await center_data.client.async_close()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the saved readings of a removed config entry."""
+    await EmuReadingsStore(hass, entry.entry_id).async_remove()
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options have changed.
+
+    Meters found by the background discovery only change the data of the entry,
+    they are added without a reload.
+    """
+    center_data: EmuCenterData | None = hass.data[DOMAIN].get(entry.entry_id)
+    if center_data is not None and center_data.options == dict(entry.options):
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
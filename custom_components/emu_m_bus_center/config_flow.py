@@ -8,6 +8,7 @@ import logging
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers.selector import (
     TextSelector,
     TextSelectorConfig,
@@ -16,7 +17,29 @@ from homeassistant.helpers.selector import (
 from homeassistant.util.network import is_ipv4_address, is_ipv6_address
 
 from . import EmuApiClient
-from .const import DOMAIN
+from .const import (
+    CONF_ALIGNED_POLLING,
+    CONF_BACKGROUND_DISCOVERY,
+    CONF_FULL_SCAN,
+    CONF_LIVENESS_CACHE_TTL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUESTS_PER_SECOND,
+    CONF_RESCAN_CANDIDATES,
+    CONF_STALE_MAX_MINUTES,
+    CONF_STALE_MAX_POLLS,
+    CONF_USE_METER_LIST,
+    DEFAULT_ALIGNED_POLLING,
+    DEFAULT_BACKGROUND_DISCOVERY,
+    DEFAULT_LIVENESS_CACHE_TTL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_STALE_MAX_MINUTES,
+    DEFAULT_STALE_MAX_POLLS,
+    DEFAULT_USE_METER_LIST,
+    DOMAIN,
+)
+from .device_types.devices import generic_sensor_deserializer
+from .scan import EmuScanCache, ScanReport, async_scan, parse_candidate_ids, scan_record
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +52,14 @@ class CenterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     _sensor_tuples = {}
     _ip = ""
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> EmuOptionsFlow:
+        """Get the options flow for this handler."""
+        return EmuOptionsFlow()
+
     async def async_step_user(self, user_input=None):
         """Get the config details from the user."""
         errors = {}
@@ -36,11 +67,35 @@ class CenterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ip = user_input.get("ip", "")
             if is_ipv4_address(ip) or is_ipv6_address(ip):
                 client = EmuApiClient(ip=ip)
-                connection_info = await client.validate_connection_async(sensors=None)
-                _LOGGER.debug("async_step_user got connectionInfo %s", connection_info)
-                if connection_info and connection_info.get("found_center"):
-                    sensors = await client.scan_for_sensors_async()
-                    sensor_dicts = [sensor.to_dict() for sensor in sensors]
+                try:
+                    connection_info = await client.validate_connection_async(
+                        sensors=None
+                    )
+                    _LOGGER.debug(
+                        "async_step_user got connectionInfo %s", connection_info
+                    )
+                    # A Center that was scanned before only has its known IDs
+                    # probed again, unless a full scan is requested
+                    report = (
+                        await async_scan(
+                            client,
+                            EmuScanCache(self.hass, ip),
+                            full_scan=user_input.get(CONF_FULL_SCAN, False),
+                            use_meter_list=user_input.get(
+                                CONF_USE_METER_LIST, DEFAULT_USE_METER_LIST
+                            ),
+                        )
+                        if connection_info and connection_info.get("found_center")
+                        else None
+                    )
+                finally:
+                    await client.async_close()
+                if report is not None:
+                    sensor_dicts = [
+                        sensor.to_dict()
+                        for sensor in report.sensors
+                        if sensor.device_type is not None
+                    ]
                     return self.async_create_entry(
                         title=user_input.get("name", "Emu M-Bus Center"),
                         data={
@@ -48,6 +103,13 @@ class CenterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                             "ip": ip,
                             "name": user_input.get("name", "Emu M-Bus Center"),
                         },
+                        # Rescans and the background discovery ask the meter
+                        # list as well if it was used here
+                        options={
+                            CONF_USE_METER_LIST: user_input.get(
+                                CONF_USE_METER_LIST, DEFAULT_USE_METER_LIST
+                            )
+                        },
                     )
                 _LOGGER.error("async step_user determined invalid connection")
                 errors["base"] = "invalid_connection"
@@ -62,7 +124,184 @@ class CenterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         TextSelectorConfig(type=TextSelectorType.URL)
                     ),
                     vol.Required("name"): str,
+                    vol.Optional(CONF_FULL_SCAN, default=False): bool,
+                    vol.Optional(
+                        CONF_USE_METER_LIST, default=DEFAULT_USE_METER_LIST
+                    ): bool,
                 }
             ),
             errors=errors,
         )
+
+
+class EmuOptionsFlow(config_entries.OptionsFlow):
+    """Implement the options flow."""
+
+    _report: ScanReport | None = None
+    _candidates = ""
+    _use_meter_list = DEFAULT_USE_METER_LIST
+
+    async def async_step_init(self, user_input=None):
+        """Choose between the polling options and a rescan of the Center."""
+        return self.async_show_menu(step_id="init", menu_options=["polling", "rescan"])
+
+    async def async_step_polling(self, user_input=None):
+        """Manage how the M-Bus Center is polled."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={**self.config_entry.options, **user_input}
+            )
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="polling",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_ALIGNED_POLLING,
+                        default=options.get(
+                            CONF_ALIGNED_POLLING, DEFAULT_ALIGNED_POLLING
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                    vol.Optional(
+                        CONF_REQUESTS_PER_SECOND,
+                        default=options.get(
+                            CONF_REQUESTS_PER_SECOND, DEFAULT_REQUESTS_PER_SECOND
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=100)),
+                    vol.Optional(
+                        CONF_STALE_MAX_POLLS,
+                        default=options.get(
+                            CONF_STALE_MAX_POLLS, DEFAULT_STALE_MAX_POLLS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                    vol.Optional(
+                        CONF_STALE_MAX_MINUTES,
+                        default=options.get(
+                            CONF_STALE_MAX_MINUTES, DEFAULT_STALE_MAX_MINUTES
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_LIVENESS_CACHE_TTL,
+                        default=options.get(
+                            CONF_LIVENESS_CACHE_TTL, DEFAULT_LIVENESS_CACHE_TTL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_BACKGROUND_DISCOVERY,
+                        default=options.get(
+                            CONF_BACKGROUND_DISCOVERY, DEFAULT_BACKGROUND_DISCOVERY
+                        ),
+                    ): bool,
+                }
+            ),
+        )
+
+    async def async_step_rescan(self, user_input=None):
+        """Look for meters that were added to, removed from or changed on the Center."""
+        errors = {}
+        if user_input is not None:
+            self._candidates = user_input.get(CONF_RESCAN_CANDIDATES, "")
+            self._use_meter_list = user_input.get(
+                CONF_USE_METER_LIST, DEFAULT_USE_METER_LIST
+            )
+            try:
+                candidate_ids = parse_candidate_ids(self._candidates)
+            except ValueError:
+                errors[CONF_RESCAN_CANDIDATES] = "invalid_candidates"
+            else:
+                sensors = json.loads(
+                    self.config_entry.data["sensors"],
+                    object_hook=generic_sensor_deserializer,
+                )
+                client = EmuApiClient(ip=self.config_entry.data["ip"])
+                try:
+                    self._report = await async_scan(
+                        client,
+                        EmuScanCache(self.hass, self.config_entry.data["ip"]),
+                        known={
+                            sensor.sensor_id: scan_record(sensor) for sensor in sensors
+                        },
+                        candidate_ids=candidate_ids,
+                        full_scan=user_input.get(CONF_FULL_SCAN, False),
+                        use_meter_list=self._use_meter_list,
+                    )
+                finally:
+                    await client.async_close()
+                return await self.async_step_rescan_result()
+
+        return self.async_show_form(
+            step_id="rescan",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_RESCAN_CANDIDATES,
+                        default=self.config_entry.options.get(
+                            CONF_RESCAN_CANDIDATES, ""
+                        ),
+                    ): str,
+                    vol.Optional(CONF_FULL_SCAN, default=False): bool,
+                    vol.Optional(
+                        CONF_USE_METER_LIST,
+                        default=self.config_entry.options.get(
+                            CONF_USE_METER_LIST, DEFAULT_USE_METER_LIST
+                        ),
+                    ): bool,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_rescan_result(self, user_input=None):
+        """Show what the rescan found and take over the meters it found."""
+        report = self._report
+        options = {
+            **self.config_entry.options,
+            CONF_RESCAN_CANDIDATES: self._candidates,
+            CONF_USE_METER_LIST: self._use_meter_list,
+        }
+        if user_input is not None:
+            if report.has_changes:
+                self.hass.config_entries.async_update_entry(
+                    self.config_entry,
+                    data={
+                        **self.config_entry.data,
+                        "sensors": json.dumps(
+                            [
+                                sensor.to_dict()
+                                for sensor in report.sensors
+                                if sensor.device_type is not None
+                            ]
+                        ),
+                    },
+                )
+                # A change of the data alone does not reload the entry, changed
+                # options do so when the flow finishes
+                if options == dict(self.config_entry.options):
+                    self.hass.config_entries.async_schedule_reload(
+                        self.config_entry.entry_id
+                    )
+            return self.async_create_entry(data=options)
+
+        return self.async_show_form(
+            step_id="rescan_result",
+            data_schema=vol.Schema({}),
+            description_placeholders={
+                "found": str(len(report.sensors)),
+                "added": _format_ids(report.added),
+                "removed": _format_ids(report.removed),
+                "changed": _format_ids(report.changed),
+            },
+        )
+
+
+def _format_ids(sensor_ids: list[int]) -> str:
+    """List sensor IDs for the rescan report."""
+    return ", ".join(str(sensor_id) for sensor_id in sensor_ids) or "-"
@@ -2,6 +2,83 @@
 
 DOMAIN = "emu_m_bus_center"
 
+# HTTP connection handling towards the M-Bus Center
+REQUEST_TIMEOUT = 10
+CONNECTION_LIMIT = 4
+KEEPALIVE_TIMEOUT = 75
+
+# Retries of transient errors while reading a sensor, in seconds
+READ_RETRY_ATTEMPTS = 3
+READ_ATTEMPT_TIMEOUT = 5
+READ_RETRY_DELAY = 1
+READ_RETRY_DEADLINE = 20
+
+# Liveness check of the Center, looks for the logo in its web interface
+CENTER_MARKER = b"emu_logo_128px"
+LIVENESS_CHUNK_SIZE = 1024
+LIVENESS_MAX_BYTES = 256 * 1024
+
+# Circuit breaker, pauses meter reads after consecutive connection failures
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_BACKOFF_BASE = 30
+BREAKER_BACKOFF_MAX = 600
+
+# Sensor scan, the M-Bus Center 250 addresses IDs 0..249
+SCAN_MAX_ID = 250
+SCAN_PROBE_TIMEOUT = 3
+# Endpoints that may list the configured meters, tried in order before probing
+# every ID when CONF_USE_METER_LIST is set. Not documented by EMU and not verified
+# on a Center yet, so they are only asked if the user opts in.
+METER_LIST_PATHS = ("/app/api/id.json", "/app/api/ids.json", "/app/api/devices.json")
+
+# Background discovery of new meters, probes a few unused IDs every interval
+DISCOVERY_INTERVAL = 600
+DISCOVERY_BATCH_SIZE = 25
+DISCOVERY_MAX_IN_FLIGHT = 1
+
+# Validation of the configured sensors during setup
+VALIDATION_DEADLINE = 30
+# Seconds a validated payload may stand in for the first poll of a sensor
+RESPONSE_CACHE_TTL = 30
+
+# Polling of all meters of a Center, in seconds. POLL_INTERVAL applies until the
+# logger interval of a meter has been learned from its timestamps.
+POLL_INTERVAL = 60
+POLL_MIN_INTERVAL = 10
+POLL_MAX_INTERVAL = 900
+POLL_LOGGER_MARGIN = 5
+POLL_STALE_RETRY = 10
+POLL_BATCH_WINDOW = 2
+
+# Quarantine, slow retry lane for meters that keep failing
+QUARANTINE_THRESHOLD = 3
+QUARANTINE_BACKOFF_BASE = 300
+QUARANTINE_BACKOFF_MAX = 3600
+
+# Persistence of the last readings, save at most every STORE_SAVE_DELAY seconds
+STORE_VERSION = 1
+STORE_SAVE_DELAY = 60
+
+# Options
+CONF_ALIGNED_POLLING = "aligned_polling"
+DEFAULT_ALIGNED_POLLING = False
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = CONNECTION_LIMIT
+CONF_REQUESTS_PER_SECOND = "requests_per_second"
+DEFAULT_REQUESTS_PER_SECOND = 10.0
+CONF_STALE_MAX_POLLS = "stale_max_polls"
+DEFAULT_STALE_MAX_POLLS = 3
+CONF_STALE_MAX_MINUTES = "stale_max_minutes"
+DEFAULT_STALE_MAX_MINUTES = 10
+CONF_LIVENESS_CACHE_TTL = "liveness_cache_ttl"
+DEFAULT_LIVENESS_CACHE_TTL = 300
+CONF_RESCAN_CANDIDATES = "rescan_candidates"
+CONF_FULL_SCAN = "full_scan"
+CONF_BACKGROUND_DISCOVERY = "background_discovery"
+DEFAULT_BACKGROUND_DISCOVERY = False
+CONF_USE_METER_LIST = "use_meter_list"
+DEFAULT_USE_METER_LIST = False
+
 
 ACTIVE_ENERGY_TARIFF_1 = "Active Energy Tariff 1"
 ACTIVE_ENERGY_TARIFF_2 = "Active Energy Tariff 2"
@@ -50,4 +127,5 @@ CFG_PHASE = "Configured Phase"
 CFG_FACTOR = "Configured Factor"
 CFG_TARIFF = "Configured Tariff"
 TIMESTAMP = "Timestamp"
+STALE_SINCE = "Stale Since"
 VOLUME = "Volume"
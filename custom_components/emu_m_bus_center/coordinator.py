@@ -0,0 +1,473 @@
+"""Coordinate the polling of all meters connected to one M-Bus Center."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
+import logging
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEFAULT_ALIGNED_POLLING,
+    DEFAULT_STALE_MAX_MINUTES,
+    DEFAULT_STALE_MAX_POLLS,
+    POLL_BATCH_WINDOW,
+    POLL_INTERVAL,
+    POLL_LOGGER_MARGIN,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+    POLL_STALE_RETRY,
+    QUARANTINE_BACKOFF_BASE,
+    QUARANTINE_BACKOFF_MAX,
+    QUARANTINE_THRESHOLD,
+)
+from .emu_client import EmuApiClient, get_logger_timestamp
+from .statistics import EmuStatisticsImporter
+from .store import EmuReadingsStore
+
+if TYPE_CHECKING:
+    from .discovery import EmuMeterDiscovery
+    from .sensor import EmuCoordinator, EmuReading
+
+
+@dataclass
+class EmuCenterData:
+    """Everything kept at runtime for one M-Bus Center in hass.data[DOMAIN]."""
+
+    client: EmuApiClient
+    store: EmuReadingsStore
+    options: dict[str, Any] = field(default_factory=dict)
+    coordinator: EmuCenterCoordinator | None = None
+    discovery: EmuMeterDiscovery | None = None
+
+
+@dataclass
+class MeterSchedule:
+    """When to poll a meter next, learned from the logger timestamps of the Center."""
+
+    next_poll: float = 0.0
+    phase: float = 0.0
+    logger_interval: float | None = None
+    # Only timestamps read since the start, a restored one would count the
+    # downtime as a gap of the logger
+    last_seen_timestamp: int | None = None
+    last_logger_delta: float | None = None
+    stale_polls: int = 0
+    consecutive_failures: int = 0
+    quarantined: bool = False
+
+
+class EmuCenterCoordinator(DataUpdateCoordinator):
+    """Poll every meter of one M-Bus Center in a single cycle.
+
+    The data is a read-only snapshot mapping each sensor ID to the readings of the
+    meter keyed by sensor name, or None if the meter could not be read in this
+    cycle. The per-meter coordinators subscribe to this coordinator and hand their
+    part of the snapshot to their entities.
+
+    Each cycle only reads the meters that are due. A meter is scheduled just after
+    the Center is expected to log its next sample, as learned from successive
+    logger timestamps, and is polled every POLL_INTERVAL until that is known.
+
+    To avoid hitting the Center with all requests at once, every meter gets a fixed
+    phase derived from its sensor ID that spreads the polls evenly over the
+    interval. With aligned polling all meters are read in every cycle instead, so
+    each snapshot is consistent across meters.
+
+    A meter that fails QUARANTINE_THRESHOLD times in a row is quarantined: it is
+    retried with an exponential backoff until it answers again, also with aligned
+    polling.
+
+    A meter that could not be read keeps serving its last readings, flagged as
+    stale, for up to stale_max_polls missed polls or stale_max_minutes, and only
+    then becomes unavailable.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: logging.Logger,
+        client: EmuApiClient,
+        center_name: str,
+        meters: list[EmuCoordinator],
+        aligned_polling: bool = DEFAULT_ALIGNED_POLLING,
+        stale_max_polls: int = DEFAULT_STALE_MAX_POLLS,
+        stale_max_minutes: float = DEFAULT_STALE_MAX_MINUTES,
+        store: EmuReadingsStore | None = None,
+    ) -> None:
+        """Create a new Coordinator object for a whole M-Bus Center."""
+        self._client = client
+        self._store = store
+        self._meters = meters
+        self._aligned_polling = aligned_polling
+        self._stale_max_polls = stale_max_polls
+        self._stale_max_age = timedelta(minutes=stale_max_minutes)
+        self._statistics = EmuStatisticsImporter(hass)
+        self._epoch = time.monotonic()
+        self._schedules = {meter.sensor_id: MeterSchedule() for meter in meters}
+        self._reads: dict[int, asyncio.Task] = {}
+        self._assign_phases()
+
+        super().__init__(
+            hass=hass,
+            logger=logger,
+            name=center_name,
+            update_interval=timedelta(seconds=POLL_INTERVAL),
+        )
+
+    @property
+    def meters(self) -> list[EmuCoordinator]:
+        """Get the coordinators of all meters polled by this Center."""
+        return self._meters
+
+    @property
+    def schedules(self) -> Mapping[int, MeterSchedule]:
+        """Get the poll schedule of every meter, keyed by sensor ID."""
+        return MappingProxyType(self._schedules)
+
+    @property
+    def statistics(self) -> EmuStatisticsImporter:
+        """Get the importer that backfills the long-term statistics of the meters."""
+        return self._statistics
+
+    @property
+    def quarantined_sensor_ids(self) -> list[int]:
+        """Get the IDs of the meters that are parked in the slow retry lane."""
+        return [
+            sensor_id
+            for sensor_id, schedule in self._schedules.items()
+            if schedule.quarantined
+        ]
+
+    @callback
+    def async_add_meter_listener(self, meter: EmuCoordinator) -> CALLBACK_TYPE:
+        """Hand the meter its values after every poll cycle of the Center."""
+
+        @callback
+        def _handle_center_update() -> None:
+            readings = (
+                self.data.get(meter.sensor_id)
+                if self.last_update_success and self.data
+                else None
+            )
+            if (readings is None or meter.missed_polls) and meter.data is not None:
+                if self._within_staleness_budget(meter):
+                    # Keep the last readings while the meter is retried, the
+                    # entities flag them as stale
+                    if meter.stale_since is None:
+                        meter.stale_since = dt_util.utcnow()
+                    meter.async_update_listeners()
+                    return
+                readings = None
+            elif (
+                readings is not None
+                and readings is meter.data
+                and meter.stale_since is None
+            ):
+                # Unchanged readings are handed back as the very same object,
+                # there is nothing new for the entities of this meter
+                return
+            meter.stale_since = None
+            meter.async_set_updated_data(readings)
+
+        return self.async_add_listener(_handle_center_update)
+
+    def _within_staleness_budget(self, meter: EmuCoordinator) -> bool:
+        """Check whether the meter may keep serving its last readings.
+
+        Both budgets apply from the first missed poll on, a budget of 0 marks the
+        meter unavailable right away. A quarantined meter is unavailable, whatever
+        is left of its budget.
+        """
+        if (
+            self._schedules[meter.sensor_id].quarantined
+            or not self._stale_max_polls
+            or not self._stale_max_age
+            or meter.missed_polls > self._stale_max_polls
+        ):
+            return False
+        return (
+            meter.stale_since is None
+            or dt_util.utcnow() - meter.stale_since < self._stale_max_age
+        )
+
+    @callback
+    def async_add_meter(self, meter: EmuCoordinator) -> CALLBACK_TYPE:
+        """Start polling a meter that was discovered while the Center is running.
+
+        The meter is read in the next cycle. Returns the callback that removes its
+        listener.
+        """
+        self._meters.append(meter)
+        self._schedules[meter.sensor_id] = MeterSchedule()
+        self._assign_phases()
+        return self.async_add_meter_listener(meter)
+
+    async def async_refresh_meter(self, meter: EmuCoordinator) -> None:
+        """Read a meter right away, e.g. when an update of its entities is requested.
+
+        The meter is marked due and read in a cycle of the Center, so a failed read
+        counts towards its staleness budget and quarantine like any other poll.
+        """
+        self._schedules[meter.sensor_id].next_poll = 0.0
+        await self.async_request_refresh()
+
+    def _assign_phases(self) -> None:
+        """Spread the meters evenly over the poll interval, ordered by sensor ID."""
+        sensor_ids = sorted(self._schedules)
+        for rank, sensor_id in enumerate(sensor_ids):
+            self._schedules[sensor_id].phase = (
+                0.0 if self._aligned_polling else rank / len(sensor_ids)
+            )
+
+    async def async_read_meter(
+        self, meter: EmuCoordinator
+    ) -> Mapping[str, EmuReading] | None:
+        """Read a single meter of the Center.
+
+        Concurrent reads of the same meter share a single fetch and parse, and all
+        callers get the very same readings.
+        """
+        sensor_id = meter.sensor_id
+        task = self._reads.get(sensor_id)
+        if task is None:
+            task = self._reads[sensor_id] = asyncio.create_task(
+                self._async_read_meter_once(meter),
+                name=f"emu_m_bus_center read {self.name} {sensor_id}",
+            )
+            task.add_done_callback(lambda _: self._reads.pop(sensor_id, None))
+        # A caller that gives up must not cancel the read for the others
+        return await asyncio.shield(task)
+
+    async def _async_read_meter_once(
+        self, meter: EmuCoordinator
+    ) -> Mapping[str, EmuReading] | None:
+        """Fetch and parse the readings of one meter.
+
+        The Center only produces new values at its own logger interval. If the
+        logger timestamp has not advanced since the last read, the readings parsed
+        for that timestamp are returned as they are, without parsing the response
+        again. New readings are saved for the next start, and new samples of the
+        meter's counters are imported into the long-term statistics.
+        """
+        device = await self._client.fetch_device_async(meter.sensor_id)
+        if device is None:
+            return None
+
+        logger_timestamp = get_logger_timestamp(device)
+        if (
+            logger_timestamp is not None
+            and logger_timestamp == meter.last_logger_timestamp
+            and meter.last_readings is not None
+        ):
+            meter.unchanged_polls += 1
+            return meter.last_readings
+
+        readings = self._client.parse_device(device, meter)
+        # The timestamp only ever moves together with the readings parsed for it,
+        # meter.data may not have caught up yet
+        meter.last_logger_timestamp = logger_timestamp if readings else None
+        meter.last_readings = readings or None
+        if readings:
+            if self._store is not None:
+                self._store.async_set(meter.sensor_id, logger_timestamp, readings)
+            try:
+                await self._statistics.async_import(meter, device)
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.warning(
+                    "Could not import the history of sensor %i into the statistics: %s",
+                    meter.sensor_id,
+                    e,
+                )
+        return readings
+
+    async def _read_meter(
+        self, meter: EmuCoordinator, semaphore: asyncio.Semaphore
+    ) -> Mapping[str, EmuReading] | None:
+        """Read a single meter, holding one of the Center's request slots.
+
+        Whatever goes wrong with one meter is counted as a failed read of that
+        meter, it must not fail the cycle for the other meters of the Center.
+        """
+        async with semaphore:
+            try:
+                readings = await self.async_read_meter(meter)
+            except Exception:
+                self.logger.exception(
+                    "Unexpected error while reading sensor %i on %s",
+                    meter.sensor_id,
+                    self.name,
+                )
+                readings = None
+        self._schedule_meter(meter, readings)
+        return readings
+
+    def _schedule_meter(
+        self,
+        meter: EmuCoordinator,
+        readings: Mapping[str, EmuReading] | None,
+    ) -> None:
+        """Decide when to poll the meter next, based on what this read returned."""
+        schedule = self._schedules[meter.sensor_id]
+        now = time.monotonic()
+        timestamp = meter.last_logger_timestamp
+
+        if readings is None or timestamp is None:
+            meter.missed_polls += 1
+            schedule.stale_polls = 0
+            if self._client.breaker.is_open:
+                # The Center is down, that says nothing about this meter
+                schedule.next_poll = self._next_slot(schedule, now)
+                return
+            self._record_meter_failure(meter, schedule, now)
+            return
+
+        if schedule.quarantined:
+            self.logger.info(
+                "Sensor %i on %s answered again, leaving quarantine",
+                meter.sensor_id,
+                self.name,
+            )
+        meter.missed_polls = 0
+        schedule.consecutive_failures = 0
+        schedule.quarantined = False
+        previous_timestamp = schedule.last_seen_timestamp
+        schedule.last_seen_timestamp = timestamp
+
+        if timestamp == previous_timestamp:
+            if schedule.logger_interval is None:
+                schedule.next_poll = self._next_slot(schedule, now)
+                return
+            # The sample we expected is not there yet, look again with a backoff
+            schedule.stale_polls += 1
+            schedule.next_poll = now + min(
+                POLL_STALE_RETRY * 2 ** (schedule.stale_polls - 1),
+                schedule.logger_interval,
+                POLL_MAX_INTERVAL,
+            )
+            return
+
+        schedule.stale_polls = 0
+        if previous_timestamp is not None and timestamp > previous_timestamp:
+            # Take the smaller of the last two gaps, so a single missed sample
+            # does not double the learned interval
+            delta = timestamp - previous_timestamp
+            schedule.logger_interval = min(delta, schedule.last_logger_delta or delta)
+            schedule.last_logger_delta = delta
+
+        if schedule.logger_interval is None:
+            schedule.next_poll = self._next_slot(schedule, now)
+            return
+
+        # The logger timestamps are in the Center's wall clock, a skewed clock only
+        # shifts the poll within one logger interval
+        sample_age = min(max(time.time() - timestamp, 0), schedule.logger_interval)
+        schedule.next_poll = now + min(
+            schedule.logger_interval
+            - sample_age
+            + POLL_LOGGER_MARGIN
+            + schedule.phase * min(POLL_INTERVAL, schedule.logger_interval),
+            POLL_MAX_INTERVAL,
+        )
+
+    def _record_meter_failure(
+        self, meter: EmuCoordinator, schedule: MeterSchedule, now: float
+    ) -> None:
+        """Move a meter that keeps failing to a slow retry lane."""
+        schedule.consecutive_failures += 1
+        if schedule.consecutive_failures < QUARANTINE_THRESHOLD:
+            schedule.next_poll = self._next_slot(schedule, now)
+            return
+
+        if not schedule.quarantined:
+            self.logger.warning(
+                "Sensor %i on %s failed %i times in a row, retrying it less often",
+                meter.sensor_id,
+                self.name,
+                schedule.consecutive_failures,
+            )
+        schedule.quarantined = True
+        schedule.next_poll = now + min(
+            QUARANTINE_BACKOFF_BASE
+            * 2 ** (schedule.consecutive_failures - QUARANTINE_THRESHOLD),
+            QUARANTINE_BACKOFF_MAX,
+        )
+
+    def _next_slot(self, schedule: MeterSchedule, now: float) -> float:
+        """Get the next point on the meter's phase shifted POLL_INTERVAL grid."""
+        offset = (self._epoch + schedule.phase * POLL_INTERVAL - now) % POLL_INTERVAL
+        # A meter polled just ahead of its slot moves on to the following one
+        if offset <= POLL_BATCH_WINDOW:
+            offset += POLL_INTERVAL
+        return now + offset
+
+    async def _async_update_data(
+        self,
+    ) -> Mapping[int, Mapping[str, EmuReading] | None]:
+        """Fetch all meters of the Center that are due with bounded concurrency."""
+        breaker = self._client.breaker
+        if breaker.is_open:
+            if breaker.seconds_until_probe > 0 or not (
+                await self._client.probe_center_async()
+            ):
+                self._schedule_next_cycle()
+                raise UpdateFailed(
+                    f"{self.name} is unreachable, next liveness probe in "
+                    f"{breaker.seconds_until_probe:.0f}s"
+                )
+            # The Center is back, read every meter that is not parked right away
+            for schedule in self._schedules.values():
+                if not schedule.quarantined:
+                    schedule.next_poll = 0.0
+
+        now = time.monotonic()
+        # Aligned polling reads every meter, except those parked in quarantine
+        due = [
+            meter
+            for meter in self._meters
+            if (
+                self._aligned_polling
+                and not self._schedules[meter.sensor_id].quarantined
+            )
+            or self._schedules[meter.sensor_id].next_poll <= now + POLL_BATCH_WINDOW
+        ]
+        semaphore = asyncio.Semaphore(self._client.limiter.max_concurrent)
+        results = await asyncio.gather(
+            *(self._read_meter(meter, semaphore) for meter in due)
+        )
+        read = {
+            meter.sensor_id: result for meter, result in zip(due, results, strict=True)
+        }
+        self._schedule_next_cycle()
+
+        # Meters that were not due keep their current readings
+        snapshot = {
+            meter.sensor_id: read.get(meter.sensor_id, meter.data)
+            for meter in self._meters
+        }
+        if self._meters and all(result is None for result in snapshot.values()):
+            raise UpdateFailed(f"Could not read any sensor from {self.name}")
+
+        return MappingProxyType(snapshot)
+
+    def _schedule_next_cycle(self) -> None:
+        """Wake up again when the next meter or liveness probe is due."""
+        next_poll = min(
+            (schedule.next_poll for schedule in self._schedules.values()),
+            default=time.monotonic() + POLL_INTERVAL,
+        )
+        if self._client.breaker.is_open:
+            next_poll = self._client.breaker.next_probe
+        self.update_interval = timedelta(
+            seconds=min(
+                max(next_poll - time.monotonic(), POLL_MIN_INTERVAL), POLL_MAX_INTERVAL
+            )
+        )
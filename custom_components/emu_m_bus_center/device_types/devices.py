@@ -114,6 +114,8 @@ class Generic_sensor:
     serial_number: int
     name: str
     device_type: Device_type
+    version: int | None = None
+    value_count: int | None = None
 
     @staticmethod
     def from_dict(data):
@@ -0,0 +1,88 @@
+"""Diagnostics support for the Emu M-Bus Center integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import EmuCenterCoordinator, EmuCenterData
+
+if TYPE_CHECKING:
+    from .sensor import EmuCoordinator
+
+TO_REDACT = {"ip"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    center_data: EmuCenterData = hass.data[DOMAIN][config_entry.entry_id]
+    center = center_data.coordinator
+    limiter = center_data.client.limiter
+    breaker = center_data.client.breaker
+
+    return {
+        "config_entry": async_redact_data(dict(config_entry.data), TO_REDACT),
+        "options": dict(config_entry.options),
+        "request_limiter": {
+            "max_concurrent": limiter.max_concurrent,
+            "requests_per_second": limiter.requests_per_second,
+            "requests": limiter.requests,
+            "queued_requests": limiter.queued_requests,
+            "average_queueing_delay": limiter.average_queueing_delay,
+            "max_queueing_delay": limiter.max_queueing_delay,
+        },
+        "reads": {
+            "reads_retried": center_data.client.reads_retried,
+            "reads_recovered_by_retry": center_data.client.reads_recovered_by_retry,
+            "coalesced_reads": center_data.client.coalesced_reads,
+        },
+        "circuit_breaker": {
+            "is_open": breaker.is_open,
+            "consecutive_failures": breaker.consecutive_failures,
+            "failed_probes": breaker.failed_probes,
+            "seconds_until_probe": breaker.seconds_until_probe
+            if breaker.is_open
+            else None,
+        },
+        "center": None
+        if center is None
+        else {
+            "last_update_success": center.last_update_success,
+            "update_interval": center.update_interval.total_seconds(),
+            "quarantined_sensor_ids": center.quarantined_sensor_ids,
+            "imported_statistic_hours": center.statistics.imported_hours,
+            "discovered_sensor_ids": center_data.discovery.discovered_sensor_ids
+            if center_data.discovery
+            else None,
+            "meters": [_meter_diagnostics(center, meter) for meter in center.meters],
+        },
+    }
+
+
+def _meter_diagnostics(
+    center: EmuCenterCoordinator, meter: EmuCoordinator
+) -> dict[str, Any]:
+    """Describe the polling state of a single meter."""
+    schedule = center.schedules[meter.sensor_id]
+    return {
+        "sensor_id": meter.sensor_id,
+        "name": meter.name,
+        "model": meter.model_name,
+        "has_data": meter.data is not None,
+        "last_logger_timestamp": meter.last_logger_timestamp,
+        "phase": schedule.phase,
+        "logger_interval": schedule.logger_interval,
+        "stale_polls": schedule.stale_polls,
+        "consecutive_failures": schedule.consecutive_failures,
+        "quarantined": schedule.quarantined,
+        "unchanged_polls": meter.unchanged_polls,
+        "suppressed_state_writes": meter.suppressed_state_writes,
+        "missed_polls": meter.missed_polls,
+        "stale_since": meter.stale_since.isoformat() if meter.stale_since else None,
+    }
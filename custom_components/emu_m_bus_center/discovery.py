@@ -0,0 +1,129 @@
+"""Look for meters that were connected to the Center after it was set up."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import json
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DISCOVERY_BATCH_SIZE,
+    DISCOVERY_INTERVAL,
+    DISCOVERY_MAX_IN_FLIGHT,
+    SCAN_MAX_ID,
+)
+from .coordinator import EmuCenterCoordinator
+from .device_types.devices import Generic_sensor, generic_sensor_deserializer
+from .emu_client import EmuApiClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EmuMeterDiscovery:
+    """Probe the unused IDs of a Center in the background, a few at a time.
+
+    Every DISCOVERY_INTERVAL seconds the next DISCOVERY_BATCH_SIZE unused IDs are
+    probed one after the other, so a full round over all IDs takes a while but
+    hardly adds any load. With use_meter_list, only the IDs the Center lists that
+    are not used yet are probed instead, if it lists any. A supported meter that
+    shows up is handed to add_meter, which creates its entities, and is added to
+    the config entry without reloading it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        client: EmuApiClient,
+        center: EmuCenterCoordinator,
+        add_meter: Callable[[Generic_sensor], None],
+        use_meter_list: bool = False,
+    ) -> None:
+        """Create a new background discovery for the Center of the config entry."""
+        self._hass = hass
+        self._config_entry = config_entry
+        self._client = client
+        self._center = center
+        self._add_meter = add_meter
+        self._use_meter_list = use_meter_list
+        self._next_id = 0
+        self.discovered_sensor_ids: list[int] = []
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start probing periodically, returns the callback that stops it."""
+        return async_track_time_interval(
+            self._hass,
+            self._async_discover,
+            timedelta(seconds=DISCOVERY_INTERVAL),
+            name=f"Emu M-Bus Center discovery {self._center.name}",
+        )
+
+    def _next_batch(self) -> list[int]:
+        """Get the next unused IDs to probe, going round all IDs of the Center."""
+        used = {meter.sensor_id for meter in self._center.meters}
+        batch: list[int] = []
+        for _ in range(SCAN_MAX_ID):
+            sensor_id = self._next_id
+            self._next_id = (self._next_id + 1) % SCAN_MAX_ID
+            if sensor_id not in used:
+                batch.append(sensor_id)
+                if len(batch) == DISCOVERY_BATCH_SIZE:
+                    break
+        return batch
+
+    async def _async_discover(self, _now: datetime | None = None) -> None:
+        """Probe the next unused IDs and add the meters found there."""
+        if self._client.breaker.is_open:
+            return
+        listed = (
+            await self._client.list_meter_ids_async() if self._use_meter_list else None
+        )
+        batch = (
+            sorted(set(listed) - {meter.sensor_id for meter in self._center.meters})
+            if listed is not None
+            else self._next_batch()
+        )
+        if not batch:
+            return
+
+        found = [
+            sensor
+            for sensor in await self._client.scan_for_sensors_async(
+                max_in_flight=DISCOVERY_MAX_IN_FLIGHT, sensor_ids=batch
+            )
+            if sensor.device_type is not None
+        ]
+        if not found:
+            return
+
+        for sensor in found:
+            _LOGGER.info(
+                "Found new %s on ID %i of %s",
+                sensor.device_type.value,
+                sensor.sensor_id,
+                self._center.name,
+            )
+            self._add_meter(sensor)
+            self.discovered_sensor_ids.append(sensor.sensor_id)
+
+        sensors = json.loads(
+            self._config_entry.data["sensors"],
+            object_hook=generic_sensor_deserializer,
+        )
+        # Only the data of the entry changes, which does not reload it
+        self._hass.config_entries.async_update_entry(
+            self._config_entry,
+            data={
+                **self._config_entry.data,
+                "sensors": json.dumps(
+                    [sensor.to_dict() for sensor in [*sensors, *found]]
+                ),
+            },
+        )
+        await self._center.async_request_refresh()
@@ -1,28 +1,282 @@
 """Interact with the M-Bus Center over HTTP REST calls."""
 
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+import json
 import logging
+import random
+import time
+from typing import Any
 
 import aiohttp
 
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .const import (
+    BREAKER_BACKOFF_BASE,
+    BREAKER_BACKOFF_MAX,
+    BREAKER_FAILURE_THRESHOLD,
+    CENTER_MARKER,
+    CONNECTION_LIMIT,
+    DEFAULT_LIVENESS_CACHE_TTL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    KEEPALIVE_TIMEOUT,
+    LIVENESS_CHUNK_SIZE,
+    LIVENESS_MAX_BYTES,
+    METER_LIST_PATHS,
+    READ_ATTEMPT_TIMEOUT,
+    READ_RETRY_ATTEMPTS,
+    READ_RETRY_DEADLINE,
+    READ_RETRY_DELAY,
+    REQUEST_TIMEOUT,
+    RESPONSE_CACHE_TTL,
+    SCAN_MAX_ID,
+    SCAN_PROBE_TIMEOUT,
+    VALIDATION_DEADLINE,
+)
 from .device_types.devices import (
     Generic_sensor,
     get_enum_from_version_and_sensor_count,
     get_supported_measurement_types,
 )
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 _LOGGER = logging.getLogger(__name__)
 
 
+def create_session(limit: int = CONNECTION_LIMIT) -> aiohttp.ClientSession:
+    """Create a keep-alive HTTP session with a connection pool sized for one M-Bus Center.
+
+    The embedded web server of the Center only handles a handful of connections,
+    so the connector is bounded and surplus requests wait for a free connection.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=limit, keepalive_timeout=KEEPALIVE_TIMEOUT
+        ),
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+    )
+
+
+class RequestLimiter:
+    """Limit how many requests hit one M-Bus Center at once and per second.
+
+    Requests first wait for one of max_concurrent slots and then for a token from
+    a bucket that refills at requests_per_second. The time spent waiting is
+    recorded so queueing can be seen in the diagnostics.
+    """
+
+    def __init__(self, max_concurrent: int, requests_per_second: float) -> None:
+        """Create a new RequestLimiter object."""
+        self.max_concurrent = max_concurrent
+        self.requests_per_second = requests_per_second
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._bucket_lock = asyncio.Lock()
+        self._capacity = float(max_concurrent)
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+        self.requests = 0
+        self.queued_requests = 0
+        self.total_queueing_delay = 0.0
+        self.max_queueing_delay = 0.0
+
+    @property
+    def average_queueing_delay(self) -> float:
+        """Get the average time in seconds a queued request had to wait."""
+        if not self.queued_requests:
+            return 0.0
+        return self.total_queueing_delay / self.queued_requests
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Wait until a request may be sent to the Center."""
+        started = time.monotonic()
+        async with self._semaphore:
+            await self._take_token()
+            delay = time.monotonic() - started
+            self.requests += 1
+            if delay > 0.001:
+                self.queued_requests += 1
+                self.total_queueing_delay += delay
+                self.max_queueing_delay = max(self.max_queueing_delay, delay)
+            yield
+
+    async def _take_token(self) -> None:
+        """Take a token from the bucket, waiting for it to refill if it is empty."""
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._refilled_at) * self.requests_per_second,
+                )
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.requests_per_second)
+
+
+_REQUEST_LIMITERS: dict[str, RequestLimiter] = {}
+
+
+def get_request_limiter(
+    ip: str,
+    max_concurrent: int | None = None,
+    requests_per_second: float | None = None,
+) -> RequestLimiter:
+    """Get the limiter shared by every client talking to the Center on this IP.
+
+    Passing limits replaces a limiter that was configured differently, leaving
+    them out reuses whatever limiter already exists.
+    """
+    limiter = _REQUEST_LIMITERS.get(ip)
+    if limiter is not None and (
+        (max_concurrent is None or max_concurrent == limiter.max_concurrent)
+        and (
+            requests_per_second is None
+            or requests_per_second == limiter.requests_per_second
+        )
+    ):
+        return limiter
+
+    limiter = _REQUEST_LIMITERS[ip] = RequestLimiter(
+        max_concurrent=max_concurrent or DEFAULT_MAX_CONCURRENT_REQUESTS,
+        requests_per_second=requests_per_second or DEFAULT_REQUESTS_PER_SECOND,
+    )
+    return limiter
+
+
+# Time of the last successful liveness check per Center IP
+_LIVENESS_CACHE: dict[str, float] = {}
+
+
+class CircuitBreaker:
+    """Stop reading meters from a Center that keeps failing to answer.
+
+    After failure_threshold consecutive connection failures the breaker opens. While
+    it is open no meter is read; instead a single liveness probe is sent on an
+    exponential backoff with jitter, and the breaker closes once it succeeds.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        backoff_base: float = BREAKER_BACKOFF_BASE,
+        backoff_max: float = BREAKER_BACKOFF_MAX,
+    ) -> None:
+        """Create a new CircuitBreaker object."""
+        self._failure_threshold = failure_threshold
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self.consecutive_failures = 0
+        self.failed_probes = 0
+        self.is_open = False
+        self.next_probe = 0.0
+
+    @property
+    def seconds_until_probe(self) -> float:
+        """Get how long to wait before the next liveness probe is due."""
+        return max(self.next_probe - time.monotonic(), 0.0)
+
+    def record_success(self) -> None:
+        """Close the breaker, the Center answered."""
+        if self.is_open:
+            _LOGGER.info("M-Bus Center is reachable again, resuming requests")
+        self.consecutive_failures = 0
+        self.failed_probes = 0
+        self.is_open = False
+
+    def record_failure(self) -> None:
+        """Count a connection failure and open the breaker once there are too many."""
+        self.consecutive_failures += 1
+        if not self.is_open and self.consecutive_failures >= self._failure_threshold:
+            self.is_open = True
+            self._schedule_probe()
+            _LOGGER.warning(
+                "M-Bus Center failed %i times in a row, pausing requests for %.0fs",
+                self.consecutive_failures,
+                self.seconds_until_probe,
+            )
+
+    def record_failed_probe(self) -> None:
+        """Back off further after a liveness probe went unanswered."""
+        self.failed_probes += 1
+        self._schedule_probe()
+
+    def _schedule_probe(self) -> None:
+        delay = min(self._backoff_base * 2**self.failed_probes, self._backoff_max)
+        self.next_probe = time.monotonic() + delay * random.uniform(0.5, 1.0)
+
+
 class EmuApiClient:
     """Wrap the API of the M-Bus Center."""
 
-    def __init__(self, ip, update_coordinator: DataUpdateCoordinator | None = None):
+    def __init__(
+        self,
+        ip,
+        max_concurrent_requests: int | None = None,
+        requests_per_second: float | None = None,
+        liveness_ttl: float = DEFAULT_LIVENESS_CACHE_TTL,
+    ):
         """Create a new EmuApiClient object."""
         self._ip = ip
-        self._update_coordinator = update_coordinator
+        self._liveness_ttl = liveness_ttl
+        self._session: aiohttp.ClientSession | None = None
+        self._device_cache: dict[int, tuple[float, dict]] = {}
+        self._limiter = get_request_limiter(
+            ip, max_concurrent_requests, requests_per_second
+        )
+        self._breaker = CircuitBreaker()
+        self._in_flight: dict[int, asyncio.Task[dict | None]] = {}
+        self._meter_list_paths = METER_LIST_PATHS
+        self.reads_retried = 0
+        self.reads_recovered_by_retry = 0
+        self.coalesced_reads = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Get the pooled HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = create_session(limit=self._limiter.max_concurrent)
+        return self._session
+
+    @property
+    def limiter(self) -> RequestLimiter:
+        """Get the request limiter of the Center this client talks to."""
+        return self._limiter
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """Get the circuit breaker guarding the meter reads of this client."""
+        return self._breaker
+
+    async def async_close(self) -> None:
+        """Close the pooled HTTP session and release its connections."""
+        for task in self._in_flight.values():
+            task.cancel()
+        self._in_flight.clear()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @asynccontextmanager
+    async def _get(
+        self, url: str, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a GET request to the Center once the request limiter allows it."""
+        async with (
+            self._limiter.acquire(),
+            self.session.get(url, **kwargs) as response,
+        ):
+            yield response
 
     async def validate_connection_async(
         self, sensors: list | None
@@ -35,221 +289,542 @@ class EmuApiClient:
             "bad_sensors": [],
         }
 
-        async with aiohttp.ClientSession() as session:
-            # Check if main page contains the logo
-            try:
-                async with session.get(
-                    f"http://{self._ip}", timeout=10
-                ) as main_page_response:
-                    text = await main_page_response.text()
-                    if "emu_logo_128px" in text:
-                        result["found_center"] = True
-            except (TimeoutError, aiohttp.ClientError) as ce:
-                _LOGGER.error(
-                    "Validate Connection could not reach M-Bus Center on %s: %s",
-                    self._ip,
-                    ce,
-                )
-                return result
+        try:
+            result["found_center"] = await self._check_center_async()
+        except (TimeoutError, aiohttp.ClientError) as ce:
+            _LOGGER.error(
+                "Validate Connection could not reach M-Bus Center on %s: %s",
+                self._ip,
+                ce,
+            )
+            return result
 
-            if sensors is None or len(sensors) == 0:
-                _LOGGER.debug("Sensors was None or length 0")
-                return {**result, "found_all_sensors": True}
+        if sensors is None or len(sensors) == 0:
+            _LOGGER.debug("Sensors was None or length 0")
+            return {**result, "found_all_sensors": True}
 
-            # Sequentially validate each sensor
-            for sensor in sensors:
-                url = f"http://{self._ip}/app/api/id/{sensor.sensor_id}.json"
-                try:
-                    async with session.get(url, timeout=10) as api_response:
-                        parsed = (await api_response.json()).get("Device")
+        # Validate the sensors concurrently, bounded by the Center's request slots
+        # and an overall deadline so one dead address cannot stall the setup
+        semaphore = asyncio.Semaphore(self._limiter.max_concurrent)
+        started = time.monotonic()
 
-                    # test if we got the Info for the right device
-                    if parsed.get("Id") != int(sensor.sensor_id):
-                        _LOGGER.warning(
-                            "Got Info for the wrong Sensor! Expected %i, got %s",
-                            sensor.sensor_id,
-                            parsed.get("Id"),
-                        )
-                        result["bad_sensors"].append(sensor.sensor_id)
-                        continue
+        async def bounded_validate(sensor_id: int) -> bool:
+            async with semaphore:
+                return await self._validate_sensor_async(sensor_id)
 
-                    # Validate supported measurement type
-                    if parsed.get("Medium") not in get_supported_measurement_types():
-                        _LOGGER.warning(
-                            "Sensor %i does not provide a measurement type we know how to handle",
-                            sensor.sensor_id,
-                        )
-                        result["bad_sensors"].append(sensor.sensor_id)
-                        continue
-
-                    result["good_sensors"].append(sensor.sensor_id)
-
-                except aiohttp.ContentTypeError:
-                    _LOGGER.warning(
-                        "Center on %s did not return a valid JSON for Sensor %i",
-                        self._ip,
-                        sensor.sensor_id,
-                    )
-                    result["bad_sensors"].append(sensor.sensor_id)
-                except (ValueError, KeyError, aiohttp.ClientError) as e:
-                    _LOGGER.error(
-                        "Unexpected error when parsing response for Sensor %i: %s",
-                        sensor.sensor_id,
-                        e,
-                    )
-                    result["bad_sensors"].append(sensor.sensor_id)
+        tasks = {
+            sensor.sensor_id: asyncio.create_task(bounded_validate(sensor.sensor_id))
+            for sensor in sensors
+        }
+        _, pending = await asyncio.wait(tasks.values(), timeout=VALIDATION_DEADLINE)
+        for task in pending:
+            task.cancel()
+        if pending:
+            _LOGGER.warning(
+                "Validation of %i sensors on %s did not finish within %is",
+                len(pending),
+                self._ip,
+                VALIDATION_DEADLINE,
+            )
 
+        for sensor_id, task in tasks.items():
+            if task in pending or not task.result():
+                result["bad_sensors"].append(sensor_id)
+            else:
+                result["good_sensors"].append(sensor_id)
+
+        _LOGGER.debug(
+            "Validated %i sensors on %s in %.2fs",
+            len(sensors),
+            self._ip,
+            time.monotonic() - started,
+        )
         return {
             **result,
             "found_all_sensors": len(result["good_sensors"]) == len(sensors),
         }
 
-    async def scan_for_sensors_async(self) -> list[Generic_sensor]:
-        """Scan for available sensors on the M-Bus Center asynchronously."""
-        list_of_ids = []
-
-        async with aiohttp.ClientSession() as session:
-            for sensor_id in range(250):
-                try:
-                    url = f"http://{self._ip}/app/api/id/{sensor_id}.json"
-                    async with session.get(url, timeout=10) as response:
-                        if response.status != 200:
-                            _LOGGER.debug(
-                                "No Sensor on ID %s (status %d)",
-                                sensor_id,
-                                response.status,
-                            )
-                            continue
-
-                        parsed = (await response.json()).get("Device")
-
-                    if parsed.get("Medium") in get_supported_measurement_types():
-                        if (
-                            parsed.get("Serial")
-                            and int(parsed.get("Serial"))
-                            and parsed.get("Version")
-                            and int(parsed.get("Version"))
-                            and parsed.get("ValueDescs")
-                            and len(parsed.get("ValueDescs")) > 0
-                        ):
-                            device_type = get_enum_from_version_and_sensor_count(
-                                version=int(parsed.get("Version")),
-                                sensor_count=len(parsed.get("ValueDescs")),
-                            )
-                            if device_type is None:
-                                _LOGGER.warning(
-                                    "No device template found for sensor id %i with serial %s. "
-                                    "Reported Version is %i and sensor count is %i. "
-                                    "Manufacturer is %s, medium is %s",
-                                    sensor_id,
-                                    parsed.get("Serial"),
-                                    int(parsed.get("Version")),
-                                    len(parsed.get("ValueDescs")),
-                                    parsed.get("ManufacturerId"),
-                                    parsed.get("Medium"),
-                                )
-
-                            list_of_ids.append(
-                                Generic_sensor(
-                                    sensor_id=int(sensor_id),
-                                    serial_number=int(parsed.get("Serial")),
-                                    name=(
-                                        f"{parsed.get('Name')} ({parsed.get('Site')})"
-                                        if parsed.get("Site") and parsed.get("Name")
-                                        else parsed.get("Name") or parsed.get("Serial")
-                                    ),
-                                    device_type=device_type,
-                                )
-                            )
-                            _LOGGER.debug("%s on ID %i", device_type, sensor_id)
-                        else:
-                            _LOGGER.error(
-                                "Sensor %i did not supply a proper serial number",
-                                sensor_id,
-                            )
-
-                except aiohttp.ClientConnectionError:
-                    _LOGGER.debug("No Sensor on ID %s (connection error)", sensor_id)
-                except aiohttp.ContentTypeError:
-                    _LOGGER.error(
-                        "Center on %s did not return valid JSON for Sensor %i",
-                        self._ip,
-                        sensor_id,
-                    )
-                except (ValueError, KeyError) as e:
-                    _LOGGER.error(
-                        "Response from M-Bus Center did not satisfy expectations: %s", e
-                    )
+    async def _check_center_async(self, use_cache: bool = True) -> bool:
+        """Check if the main page of the web interface contains the logo.
+
+        The page is streamed only until the logo shows up. A positive result is
+        remembered per IP for the liveness TTL, so the config flow, the setup and
+        a reload right after each other only look once.
+        """
+        checked = _LIVENESS_CACHE.get(self._ip)
+        if (
+            use_cache
+            and checked is not None
+            and time.monotonic() - checked <= self._liveness_ttl
+        ):
+            return True
+
+        async with self._get(f"http://{self._ip}") as main_page_response:
+            alive = await _stream_contains(
+                main_page_response, CENTER_MARKER, LIVENESS_MAX_BYTES
+            )
+        if alive:
+            _LIVENESS_CACHE[self._ip] = time.monotonic()
+        else:
+            _LIVENESS_CACHE.pop(self._ip, None)
+        return alive
+
+    async def probe_center_async(self) -> bool:
+        """Send a single liveness probe to a Center the circuit breaker stopped."""
+        try:
+            # The breaker only asks once reads failed, a cached result is outdated
+            alive = await self._check_center_async(use_cache=False)
+        except (TimeoutError, aiohttp.ClientError) as ce:
+            _LOGGER.debug("Liveness probe to %s failed: %s", self._ip, ce)
+            alive = False
+        if alive:
+            self._breaker.record_success()
+        else:
+            self._breaker.record_failed_probe()
+        return alive
+
+    async def _validate_sensor_async(self, sensor_id: int) -> bool:
+        """Check that the Center delivers supported values for the given sensor."""
+        url = f"http://{self._ip}/app/api/id/{sensor_id}.json"
+        try:
+            async with self._get(url) as api_response:
+                parsed = decode_device(await api_response.read())
 
-        return list_of_ids
+            # test if we got the Info for the right device
+            if parsed.get("Id") != int(sensor_id):
+                _LOGGER.warning(
+                    "Got Info for the wrong Sensor! Expected %i, got %s",
+                    sensor_id,
+                    parsed.get("Id"),
+                )
+                return False
 
-    async def read_sensor_async(self, sensor_id: int):
-        """Fetch new state data for the sensor asynchronously."""
-        if self._update_coordinator is None:
-            raise ValueError(
-                "update_coordinator must be set before calling read_sensor_async"
+            # Validate supported measurement type
+            if parsed.get("Medium") not in get_supported_measurement_types():
+                _LOGGER.warning(
+                    "Sensor %i does not provide a measurement type we know how to handle",
+                    sensor_id,
+                )
+                return False
+
+        except TimeoutError:
+            _LOGGER.warning(
+                "Timeout while validating Sensor %i on %s", sensor_id, self._ip
+            )
+            return False
+        except (AttributeError, ValueError, KeyError, aiohttp.ClientError) as e:
+            _LOGGER.error(
+                "Unexpected error when parsing response for Sensor %i: %s",
+                sensor_id,
+                e,
             )
+            return False
+
+        self._cache_device(sensor_id, parsed)
+        return True
+
+    def _cache_device(self, sensor_id: int, device: dict) -> None:
+        """Keep a validated Device payload around for the first read of the sensor."""
+        self._device_cache[int(sensor_id)] = (time.monotonic(), device)
+
+    def _pop_cached_device(self, sensor_id: int) -> dict | None:
+        """Take a Device payload out of the cache if it is still fresh enough."""
+        now = time.monotonic()
+        self._device_cache = {
+            cached_id: cached
+            for cached_id, cached in self._device_cache.items()
+            if now - cached[0] <= RESPONSE_CACHE_TTL
+        }
+        cached = self._device_cache.pop(int(sensor_id), None)
+        return cached[1] if cached else None
+
+    async def scan_for_sensors_async(
+        self,
+        max_in_flight: int | None = None,
+        probe_timeout: float = SCAN_PROBE_TIMEOUT,
+        sensor_ids: Iterable[int] | None = None,
+    ) -> list[Generic_sensor]:
+        """Scan for available sensors on the M-Bus Center asynchronously.
+
+        Up to max_in_flight IDs are probed at the same time, as many as the request
+        limiter allows by default, pass 1 for a strictly sequential scan. Empty
+        addresses are given up on after probe_timeout seconds. Only the given
+        sensor_ids are probed if there are any, every ID the Center can address
+        if not. The result is always ordered by sensor ID.
+        """
+        sensor_ids = (
+            range(SCAN_MAX_ID) if sensor_ids is None else sorted(set(sensor_ids))
+        )
+        max_in_flight = max_in_flight or self._limiter.max_concurrent
+        semaphore = asyncio.Semaphore(max_in_flight)
+        started = time.monotonic()
+
+        async def bounded_probe(sensor_id: int) -> Generic_sensor | None:
+            async with semaphore:
+                return await self._probe_sensor_id_async(sensor_id, probe_timeout)
+
+        probes = await asyncio.gather(
+            *(bounded_probe(sensor_id) for sensor_id in sensor_ids)
+        )
+        list_of_ids = [sensor for sensor in probes if sensor is not None]
+
+        _LOGGER.debug(
+            "Scan of %i IDs on %s found %i sensors in %.2fs (%i in flight, %.1fs probe timeout)",
+            len(sensor_ids),
+            self._ip,
+            len(list_of_ids),
+            time.monotonic() - started,
+            max_in_flight,
+            probe_timeout,
+        )
+        return list_of_ids
 
-        url = f"http://{self._ip}/app/api/id/{sensor_id}.json"
+    async def list_meter_ids_async(
+        self, request_timeout: float = SCAN_PROBE_TIMEOUT
+    ) -> list[int] | None:
+        """Get the IDs of the meters configured on the Center in a single request.
 
-        def raise_error(message: str, exception_type: type[Exception]):
-            _LOGGER.error(
-                "%s during read_sensor_async: %s", exception_type.__name__, message
+        The candidate endpoints in METER_LIST_PATHS are tried in order. Returns None
+        if none of them lists any meters, the caller has to probe every ID then.
+        Endpoints the Center does not have are not asked again by this client.
+        """
+        for path in self._meter_list_paths:
+            try:
+                async with self._get(
+                    f"http://{self._ip}{path}",
+                    timeout=aiohttp.ClientTimeout(total=request_timeout),
+                ) as response:
+                    sensor_ids = (
+                        _meter_ids_from_listing(json_loads(await response.read()))
+                        if response.status == 200
+                        else []
+                    )
+            except (TimeoutError, aiohttp.ClientError) as e:
+                _LOGGER.debug("No meter list at %s on %s: %s", path, self._ip, e)
+                continue
+            except ValueError:
+                sensor_ids = []
+            if sensor_ids:
+                _LOGGER.debug(
+                    "%s on %s lists %i meters", path, self._ip, len(sensor_ids)
+                )
+                self._meter_list_paths = (path,)
+                return sensor_ids
+            self._meter_list_paths = tuple(
+                other for other in self._meter_list_paths if other != path
             )
+        return None
 
+    async def _probe_sensor_id_async(
+        self, sensor_id: int, probe_timeout: float
+    ) -> Generic_sensor | None:
+        """Probe a single ID on the M-Bus Center and describe the sensor found there."""
         try:
-            async with (
-                aiohttp.ClientSession() as session,
-                session.get(url, timeout=10) as response,
-            ):
+            url = f"http://{self._ip}/app/api/id/{sensor_id}.json"
+            async with self._get(
+                url, timeout=aiohttp.ClientTimeout(total=probe_timeout)
+            ) as response:
                 if response.status != 200:
-                    raise_error(
-                        f"Unexpected status code: {response.status}", CannotConnect
+                    _LOGGER.debug(
+                        "No Sensor on ID %s (status %d)",
+                        sensor_id,
+                        response.status,
                     )
                     return None
 
-                parsed = (await response.json()).get("Device")
+                parsed = decode_device(await response.read())
+
+            if parsed.get("Medium") in get_supported_measurement_types():
+                if (
+                    parsed.get("Serial")
+                    and int(parsed.get("Serial"))
+                    and parsed.get("Version")
+                    and int(parsed.get("Version"))
+                    and parsed.get("ValueDescs")
+                    and len(parsed.get("ValueDescs")) > 0
+                ):
+                    device_type = get_enum_from_version_and_sensor_count(
+                        version=int(parsed.get("Version")),
+                        sensor_count=len(parsed.get("ValueDescs")),
+                    )
+                    if device_type is None:
+                        _LOGGER.warning(
+                            "No device template found for sensor id %i with serial %s. "
+                            "Reported Version is %i and sensor count is %i. "
+                            "Manufacturer is %s, medium is %s",
+                            sensor_id,
+                            parsed.get("Serial"),
+                            int(parsed.get("Version")),
+                            len(parsed.get("ValueDescs")),
+                            parsed.get("ManufacturerId"),
+                            parsed.get("Medium"),
+                        )
 
+                    _LOGGER.debug("%s on ID %i", device_type, sensor_id)
+                    return Generic_sensor(
+                        sensor_id=int(sensor_id),
+                        serial_number=int(parsed.get("Serial")),
+                        name=(
+                            f"{parsed.get('Name')} ({parsed.get('Site')})"
+                            if parsed.get("Site") and parsed.get("Name")
+                            else parsed.get("Name") or parsed.get("Serial")
+                        ),
+                        device_type=device_type,
+                        version=int(parsed.get("Version")),
+                        value_count=len(parsed.get("ValueDescs")),
+                    )
+                _LOGGER.error(
+                    "Sensor %i did not supply a proper serial number",
+                    sensor_id,
+                )
+
+        except TimeoutError:
+            _LOGGER.debug("No Sensor on ID %s (timeout)", sensor_id)
+        except aiohttp.ClientConnectionError:
+            _LOGGER.debug("No Sensor on ID %s (connection error)", sensor_id)
+        except (
+            AttributeError,
+            ValueError,
+            KeyError,
+            TypeError,
+            aiohttp.ClientError,
+        ) as e:
+            _LOGGER.error(
+                "Response from M-Bus Center did not satisfy expectations: %s", e
+            )
+        return None
+
+    async def fetch_device_async(self, sensor_id: int) -> dict | None:
+        """Fetch the "Device" part of the sensor's API response asynchronously.
+
+        Returns None, after logging why, if the Center did not deliver supported
+        data for this sensor. Concurrent calls for the same sensor share a single
+        request and its result.
+        """
+        sensor_id = int(sensor_id)
+        task = self._in_flight.get(sensor_id)
+        if task is None:
+            task = self._in_flight[sensor_id] = asyncio.create_task(
+                self._fetch_device_once_async(sensor_id),
+                name=f"emu_m_bus_center fetch {self._ip} {sensor_id}",
+            )
+            task.add_done_callback(lambda _: self._in_flight.pop(sensor_id, None))
+        else:
+            self.coalesced_reads += 1
+        # A caller that gives up must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_device_once_async(self, sensor_id: int) -> dict | None:
+        """Fetch and check the "Device" part of one sensor's API response."""
+        parsed = self._pop_cached_device(sensor_id)
+        if parsed is None:
+            parsed = await self._download_device_async(sensor_id)
+            if parsed is None:
+                return None
+
+        try:
             if parsed.get("Id") != int(sensor_id):
-                raise_error("wrong ID", ValueError)
+                _log_read_error("wrong ID", ValueError)
+                return None
 
             if parsed.get("Medium") not in get_supported_measurement_types():
-                raise_error(
+                _log_read_error(
                     "The M-Bus Center sent a valid response, but the sensor does not provide Electricity measurements",
                     ValueError,
                 )
+                return None
+        except (AttributeError, TypeError, ValueError) as e:
+            _log_read_error(
+                f"Response from M-Bus Center did not satisfy expectations: {e}",
+                CannotConnect,
+            )
+            return None
+        return parsed
 
-            if self._update_coordinator.version_number != int(
-                parsed.get("Version")
-            ) and self._update_coordinator.sensor_count == len(
-                parsed.get("ValueDescs")
-            ):
-                raise_error(
-                    "The M-Bus Center sent a valid response, but the sensor does not match the device template",
-                    EmuApiError,
-                )
-            return self._update_coordinator.parse(parsed.get("ValueDescs"))
+    async def _download_device_async(self, sensor_id: int) -> dict | None:
+        """Download the "Device" part of the sensor's API response.
+
+        Transient errors (timeouts, dropped connections, truncated or invalid bodies)
+        are retried with a jittered delay, up to READ_RETRY_ATTEMPTS attempts within
+        READ_RETRY_DEADLINE seconds.
+        """
+        url = f"http://{self._ip}/app/api/id/{sensor_id}.json"
+        deadline = time.monotonic() + READ_RETRY_DEADLINE
 
-        except aiohttp.ClientConnectionError as ce:
-            msg = str(ce)
+        for attempt in range(1, READ_RETRY_ATTEMPTS + 1):
+            if self._breaker.is_open:
+                _LOGGER.debug(
+                    "Not reading sensor %i, M-Bus Center on %s is unreachable",
+                    sensor_id,
+                    self._ip,
+                )
+                return None
+            try:
+                async with self._get(
+                    url,
+                    timeout=aiohttp.ClientTimeout(
+                        total=max(
+                            min(READ_ATTEMPT_TIMEOUT, deadline - time.monotonic()), 1
+                        )
+                    ),
+                ) as response:
+                    self._breaker.record_success()
+                    if response.status != 200:
+                        _log_read_error(
+                            f"Unexpected status code: {response.status}", CannotConnect
+                        )
+                        return None
+
+                    device = decode_device(await response.read())
+            except (
+                TimeoutError,
+                aiohttp.ClientConnectionError,
+                aiohttp.ClientPayloadError,
+                AttributeError,
+                ValueError,
+            ) as e:
+                delay = READ_RETRY_DELAY * random.uniform(0.5, 1.5)
+                if attempt < READ_RETRY_ATTEMPTS and (
+                    time.monotonic() + delay + 1 < deadline
+                ):
+                    _LOGGER.debug(
+                        "Attempt %i to read sensor %i from %s failed, retrying: %s",
+                        attempt,
+                        sensor_id,
+                        self._ip,
+                        e,
+                    )
+                    if attempt == 1:
+                        self.reads_retried += 1
+                    await asyncio.sleep(delay)
+                    continue
+                self._log_download_error(sensor_id, e)
+                return None
+
+            if attempt > 1:
+                self.reads_recovered_by_retry += 1
+            return device
+        return None
+
+    def _record_connection_failure(self) -> None:
+        """Tell the circuit breaker, and forget that the Center was alive once it opens."""
+        self._breaker.record_failure()
+        if self._breaker.is_open:
+            _LIVENESS_CACHE.pop(self._ip, None)
+
+    def _log_download_error(self, sensor_id: int, error: Exception) -> None:
+        """Log why a sensor could not be downloaded and tell the circuit breaker."""
+        if isinstance(error, TimeoutError):
+            self._record_connection_failure()
+            _log_read_error(
+                f"Timeout while reading sensor {sensor_id} from {self._ip}",
+                CannotConnect,
+            )
+        elif isinstance(error, aiohttp.ClientConnectionError):
+            self._record_connection_failure()
+            msg = str(error)
             if "Max retries exceeded" in msg:
-                raise_error(
+                _log_read_error(
                     f"Could not reach M-Bus Center on {self._ip}", CannotConnect
                 )
             elif "Remote end closed connection" in msg:
-                raise_error(f"Could not find sensor with ID {sensor_id}", CannotConnect)
+                _log_read_error(
+                    f"Could not find sensor with ID {sensor_id}", CannotConnect
+                )
             else:
-                raise_error(f"generic connection error: {ce}", CannotConnect)
-        except aiohttp.ContentTypeError:
-            raise_error(
-                f"Center on {self._ip} did not return valid JSON for Sensor {sensor_id}",
+                _log_read_error(f"generic connection error: {error}", CannotConnect)
+        elif isinstance(error, aiohttp.ClientPayloadError):
+            # The connection broke off while the body was sent
+            self._record_connection_failure()
+            _log_read_error(
+                f"Truncated response while reading sensor {sensor_id} from {self._ip}: {error}",
+                CannotConnect,
+            )
+        else:
+            _log_read_error(
+                f"Response from M-Bus Center did not satisfy expectations: {error}",
                 CannotConnect,
             )
-        except (ValueError, KeyError) as e:
-            raise_error(
+
+    @staticmethod
+    def parse_device(device: dict, update_coordinator: DataUpdateCoordinator):
+        """Parse a "Device" payload with the template of the given coordinator."""
+        try:
+            if update_coordinator.version_number != int(
+                device.get("Version")
+            ) and update_coordinator.sensor_count == len(device.get("ValueDescs")):
+                _log_read_error(
+                    "The M-Bus Center sent a valid response, but the sensor does not match the device template",
+                    EmuApiError,
+                )
+            return update_coordinator.parse(device.get("ValueDescs"))
+        except (IndexError, KeyError, TypeError, ValueError) as e:
+            _log_read_error(
                 f"Response from M-Bus Center did not satisfy expectations: {e}",
                 CannotConnect,
             )
+        return None
+
+
+async def _stream_contains(
+    response: aiohttp.ClientResponse, marker: bytes, max_bytes: int
+) -> bool:
+    """Read the body in chunks until the marker shows up or max_bytes were read."""
+    tail = b""
+    received = 0
+    async for chunk in response.content.iter_chunked(LIVENESS_CHUNK_SIZE):
+        window = tail + chunk
+        if marker in window:
+            return True
+        received += len(chunk)
+        if received >= max_bytes:
+            break
+        # Keep enough to find a marker that is split across two chunks
+        tail = window[-(len(marker) - 1) :]
+    return False
+
+
+def _meter_ids_from_listing(listing: Any) -> list[int]:
+    """Collect the sensor IDs of a meter list.
+
+    Only a top-level list of plain IDs or of objects with an "Id" is accepted.
+    Anything else, e.g. the payload of a single meter with its values, is not a
+    meter list and gives no IDs.
+    """
+    if not isinstance(listing, list):
+        return []
+    sensor_ids: set[int] = set()
+    for item in listing:
+        if isinstance(item, dict):
+            item = item.get("Id")
+        if not isinstance(item, int) or isinstance(item, bool):
+            return []
+        sensor_ids.add(item)
+    return sorted(sensor_id for sensor_id in sensor_ids if 0 <= sensor_id < SCAN_MAX_ID)
+
+
+def decode_device(body: bytes) -> dict:
+    """Decode the raw body of a sensor's API response and get its "Device" part.
+
+    Uses orjson when it is installed, the stdlib parser otherwise. Raises ValueError
+    if the body is not JSON or has no "Device" object.
+    """
+    device = json_loads(body).get("Device")
+    if device is None:
+        raise ValueError("Response from M-Bus Center has no Device object")
+    return device
+
+
+def get_logger_timestamp(device: dict) -> int | None:
+    """Get the time the Center last logged values for a sensor from its "Device" payload."""
+    try:
+        return int(device["ValueDescs"][0]["Values"][0]["Timestamp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _log_read_error(message: str, exception_type: type[Exception]) -> None:
+    _LOGGER.error("%s while reading a sensor: %s", exception_type.__name__, message)
 
 
 class CannotConnect(HomeAssistantError):
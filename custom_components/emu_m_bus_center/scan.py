@@ -0,0 +1,124 @@
+"""Remember the sensors found on a Center, so it can be rescanned quickly."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import DOMAIN, SCAN_MAX_ID, STORE_VERSION
+from .device_types.devices import Generic_sensor
+from .emu_client import EmuApiClient
+
+
+@dataclass
+class ScanReport:
+    """What a scan found compared to the sensors known before."""
+
+    sensors: list[Generic_sensor]
+    added: list[int] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+    changed: list[int] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        """Check whether the scan found anything that differs from before."""
+        return bool(self.added or self.removed or self.changed)
+
+
+class EmuScanCache:
+    """Persist the result of the last scan of the Center on one IP."""
+
+    def __init__(self, hass: HomeAssistant, ip: str) -> None:
+        """Create a new scan cache for the Center on this IP."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORE_VERSION, f"{DOMAIN}.{slugify(ip)}.scan"
+        )
+
+    async def async_load(self) -> dict[int, dict[str, Any]]:
+        """Get the sensors found by the last scan, keyed by sensor ID."""
+        return {
+            int(sensor_id): record
+            for sensor_id, record in (await self._store.async_load() or {}).items()
+        }
+
+    async def async_save(self, sensors: list[Generic_sensor]) -> None:
+        """Remember the sensors a scan found."""
+        await self._store.async_save(
+            {str(sensor.sensor_id): scan_record(sensor) for sensor in sensors}
+        )
+
+
+def scan_record(sensor: Generic_sensor) -> dict[str, Any]:
+    """Describe a sensor found by a scan."""
+    return {
+        "serial_number": sensor.serial_number,
+        "name": sensor.name,
+        "version": sensor.version,
+        "value_count": sensor.value_count,
+        "device_type": sensor.device_type.name if sensor.device_type else None,
+    }
+
+
+def parse_candidate_ids(candidates: str) -> set[int]:
+    """Parse a list of sensor IDs and ID ranges like "1-10, 42".
+
+    Raises ValueError if the list contains anything else or an ID the Center can
+    not address.
+    """
+    sensor_ids: set[int] = set()
+    for part in candidates.replace(";", ",").split(","):
+        if not (part := part.strip()):
+            continue
+        first, _, last = part.partition("-")
+        start = int(first)
+        end = int(last) if last else start
+        if not 0 <= start <= end < SCAN_MAX_ID:
+            raise ValueError(f"{part} is not within 0-{SCAN_MAX_ID - 1}")
+        sensor_ids.update(range(start, end + 1))
+    return sensor_ids
+
+
+async def async_scan(
+    client: EmuApiClient,
+    cache: EmuScanCache,
+    known: dict[int, dict[str, Any]] | None = None,
+    candidate_ids: set[int] | None = None,
+    full_scan: bool = False,
+    use_meter_list: bool = False,
+) -> ScanReport:
+    """Scan the Center and compare the result to the sensors known before.
+
+    Unless a full scan is requested, only the IDs of the known sensors and the
+    candidate IDs are probed. The sensors known from the cache are used if none
+    are given. Without any known sensors, every ID is probed. With use_meter_list,
+    the IDs the Center lists are probed as well, instead of every ID if it lists
+    any. A full scan ignores the meter list.
+    """
+    if known is None:
+        known = await cache.async_load()
+    sensor_ids = (
+        None if full_scan or not known else set(known) | (candidate_ids or set())
+    )
+    if use_meter_list and not full_scan:
+        listed = await client.list_meter_ids_async()
+        if listed is not None:
+            sensor_ids = set(listed) | (sensor_ids or set())
+    sensors = await client.scan_for_sensors_async(sensor_ids=sensor_ids)
+    await cache.async_save(sensors)
+
+    found = {sensor.sensor_id: scan_record(sensor) for sensor in sensors}
+    return ScanReport(
+        sensors=sensors,
+        added=sorted(found.keys() - known.keys()),
+        removed=sorted(known.keys() - found.keys()),
+        changed=sorted(
+            sensor_id
+            for sensor_id in found.keys() & known.keys()
+            if (found[sensor_id]["serial_number"], found[sensor_id]["device_type"])
+            != (known[sensor_id]["serial_number"], known[sensor_id]["device_type"])
+        ),
+    )
@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import abc
-from datetime import timedelta
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
 import json
 import logging
-from typing import Any
+import time
+from types import MappingProxyType
+from typing import Any, ClassVar, NamedTuple
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -31,20 +35,37 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
+    UpdateFailed,
 )
 
 from .const import (
     CFG_FACTOR,
     CFG_PHASE,
     CFG_TARIFF,
+    CONF_ALIGNED_POLLING,
+    CONF_BACKGROUND_DISCOVERY,
+    CONF_STALE_MAX_MINUTES,
+    CONF_STALE_MAX_POLLS,
+    CONF_USE_METER_LIST,
+    DEFAULT_ALIGNED_POLLING,
+    DEFAULT_BACKGROUND_DISCOVERY,
+    DEFAULT_STALE_MAX_MINUTES,
+    DEFAULT_STALE_MAX_POLLS,
+    DEFAULT_USE_METER_LIST,
     DOMAIN,
     SCALE_MANTISSA,
     SCALE_POWER,
+    STALE_SINCE,
     TARIFF,
     TIMESTAMP,
 )
-from .device_types.devices import generic_sensor_deserializer, get_class_from_enum
-from .emu_client import EmuApiClient
+from .coordinator import EmuCenterCoordinator, EmuCenterData
+from .device_types.devices import (
+    Generic_sensor,
+    generic_sensor_deserializer,
+    get_class_from_enum,
+)
+from .discovery import EmuMeterDiscovery
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,14 +76,15 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ):
     """Implement the Method to setup the sensor platform."""
+    started = time.monotonic()
     serialized_sensors_from_config = config_entry.data.get("sensors")
     sensors_from_config = json.loads(
         serialized_sensors_from_config, object_hook=generic_sensor_deserializer
     )
     center_name = config_entry.data.get("name")
-    all_sensors = []
-    for sensor in sensors_from_config:
-        coordinator = get_class_from_enum(sensor.device_type)(
+
+    def create_meter(sensor: Generic_sensor) -> EmuCoordinator:
+        return get_class_from_enum(sensor.device_type)(
             hass=hass,
             config_entry_id=config_entry.entry_id,
             logger=_LOGGER,
@@ -71,12 +93,70 @@ async def async_setup_entry(
             center_name=center_name,
             sensor_given_name=sensor.name,
         )
-        sensors = coordinator.sensors()
-        all_sensors.extend(sensors)
 
+    meters: list[EmuCoordinator] = [
+        create_meter(sensor) for sensor in sensors_from_config
+    ]
+
+    center_data: EmuCenterData = hass.data[DOMAIN][config_entry.entry_id]
+    center = center_data.coordinator = EmuCenterCoordinator(
+        hass=hass,
+        logger=_LOGGER,
+        client=center_data.client,
+        center_name=center_name,
+        meters=meters,
+        aligned_polling=config_entry.options.get(
+            CONF_ALIGNED_POLLING, DEFAULT_ALIGNED_POLLING
+        ),
+        stale_max_polls=config_entry.options.get(
+            CONF_STALE_MAX_POLLS, DEFAULT_STALE_MAX_POLLS
+        ),
+        stale_max_minutes=config_entry.options.get(
+            CONF_STALE_MAX_MINUTES, DEFAULT_STALE_MAX_MINUTES
+        ),
+        store=center_data.store,
+    )
+    for meter in meters:
+        # Show the readings from before the restart until the meter is read again
+        if (saved := center_data.store.get(meter.sensor_id)) is not None:
+            meter.restore(*saved)
+        config_entry.async_on_unload(center.async_add_meter_listener(meter))
+
+    all_sensors = [sensor for meter in meters for sensor in meter.sensors()]
     async_add_entities(all_sensors)
-    for sensor in all_sensors:
-        await sensor.coordinator.async_config_entry_first_refresh()
+    # A single refresh of the Center fetches every meter concurrently and
+    # hands the values to all entities, no per-entity refresh is needed
+    await center.async_config_entry_first_refresh()
+
+    if config_entry.options.get(
+        CONF_BACKGROUND_DISCOVERY, DEFAULT_BACKGROUND_DISCOVERY
+    ):
+
+        @callback
+        def add_meter(sensor: Generic_sensor) -> None:
+            meter = create_meter(sensor)
+            config_entry.async_on_unload(center.async_add_meter(meter))
+            async_add_entities(meter.sensors())
+
+        center_data.discovery = EmuMeterDiscovery(
+            hass,
+            config_entry,
+            center_data.client,
+            center,
+            add_meter,
+            use_meter_list=config_entry.options.get(
+                CONF_USE_METER_LIST, DEFAULT_USE_METER_LIST
+            ),
+        )
+        config_entry.async_on_unload(center_data.discovery.async_start())
+
+    _LOGGER.debug(
+        "Set up %i entities for %i meters of %s in %.2fs",
+        len(all_sensors),
+        len(meters),
+        center_name,
+        time.monotonic() - started,
+    )
 
 
 class EmuBaseSensor(CoordinatorEntity, SensorEntity):
@@ -88,6 +168,9 @@ class EmuBaseSensor(CoordinatorEntity, SensorEntity):
         self._name = coordinator.name
         self._suffix = suffix
         self._serial_no = coordinator.serial_no
+        self._last_written_state: tuple | None = None
+        if coordinator.data is not None:
+            self._apply_reading(coordinator.data.get(suffix))
 
     _attr_has_entity_name: True
     _attr_should_poll: True
@@ -128,20 +211,38 @@ class EmuBaseSensor(CoordinatorEntity, SensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if self.coordinator.data is None:
+        self._apply_reading(
+            self.coordinator.data.get(self._suffix)
+            if self.coordinator.data is not None
+            else None
+        )
+
+        # Most values (serial numbers, transformer factors, idle tariffs) do not
+        # change between polls, skip writing identical states
+        written_state = (
+            self._attr_available,
+            self._attr_native_value,
+            self._attr_extra_state_attributes,
+        )
+        if written_state == self._last_written_state:
+            self.coordinator.suppressed_state_writes += 1
+            return
+        self._last_written_state = written_state
+        self.async_write_ha_state()
+
+    def _apply_reading(self, reading: EmuReading | None) -> None:
+        """Set the state of the entity from the reading of its value."""
+        if reading is None:
             self._attr_available = False
         else:
-            item = next(
-                item
-                for item in self.coordinator.data
-                if item.get("name") == self._suffix
-            )
-            self._attr_native_value = item.pop("value")
+            self._attr_native_value = reading.value
             self._attr_available = True
-            del item["name"]
-            self._attr_extra_state_attributes = item
-
-        self.async_write_ha_state()
+            self._attr_extra_state_attributes = reading.attributes
+            if self.coordinator.stale_since is not None:
+                self._attr_extra_state_attributes = {
+                    **reading.attributes,
+                    STALE_SINCE: self.coordinator.stale_since.isoformat(),
+                }
 
 
 class EmuActiveEnergySensor(EmuBaseSensor):
@@ -284,8 +385,39 @@ class EmuVolumeSensor(EmuBaseSensor):
     _attr_icon = "mdi:counter"
 
 
+class EmuReading(NamedTuple):
+    """One parsed value of a meter and the state attributes that go with it."""
+
+    value: float
+    attributes: Mapping[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class ValueParsePlan:
+    """How to read one value of a device template from its "ValueDescs" entry."""
+
+    name: str
+    accepted_units: frozenset[str]
+    description_str: str | None
+    has_scaling_factor: bool
+    sensor_class: type[EmuBaseSensor]
+
+    def scaling_factor(self, item: dict) -> float:
+        """Get what the raw values of the "ValueDescs" entry are divided by."""
+        if not self.has_scaling_factor:
+            return 1
+        return float(item.get("CfgFactor", 1)) if item.get("CfgFactor", 1) != 0 else 1
+
+
 class EmuCoordinator(DataUpdateCoordinator, metaclass=abc.ABCMeta):
-    """Custom M-Bus Center Coordinator."""
+    """Custom M-Bus Center Coordinator.
+
+    One of these exists per meter. It does not poll on its own, the
+    EmuCenterCoordinator reads all meters of a Center and hands each
+    coordinator its values.
+    """
+
+    _parse_plans: ClassVar[dict[type[EmuCoordinator], dict[int, ValueParsePlan]]] = {}
 
     def __init__(
         self,
@@ -310,14 +442,33 @@ class EmuCoordinator(DataUpdateCoordinator, metaclass=abc.ABCMeta):
         self._config = dict(
             self._hass.config_entries.async_get_entry(self._config_entry_id).data
         )
+        self.suppressed_state_writes = 0
+        self.unchanged_polls = 0
+        self.last_logger_timestamp: int | None = None
+        self.last_readings: Mapping[str, EmuReading] | None = None
+        self.missed_polls = 0
+        self.stale_since: datetime | None = None
 
         super().__init__(
             hass=hass,
             logger=logger,
             name=self._name,
-            update_interval=timedelta(seconds=60),
+            update_interval=None,
         )
 
+    def restore(
+        self, logger_timestamp: int | None, readings: Mapping[str, list]
+    ) -> None:
+        """Take over readings saved before a restart, as value and attributes by name."""
+        self.data = MappingProxyType(
+            {
+                name: EmuReading(value=value, attributes=MappingProxyType(attributes))
+                for name, (value, attributes) in readings.items()
+            }
+        )
+        self.last_logger_timestamp = logger_timestamp
+        self.last_readings = self.data
+
     @property
     def get_hass(self):
         """Get the hass object this device is associated with."""
@@ -374,47 +525,76 @@ class EmuCoordinator(DataUpdateCoordinator, metaclass=abc.ABCMeta):
             sensor["sensor_class"](self, sensor["name"]) for sensor in self._sensors
         ]
 
-    def parse(self, data: list[dict]) -> list[dict]:
-        """Parse the "ValueDescs" part of the Output of the API to a Dict, matching the correct values."""
-        return [
-            self._extract_values(
-                data=data,
-                position=sensor["position"],
-                name=sensor["name"],
-                has_scaling_factor=sensor["has_scaling_factor"],
-                unit_str=sensor["unit_str"],
-                description_str=sensor["description_str"],
+    @property
+    def parse_plan(self) -> dict[int, ValueParsePlan]:
+        """Get how to read each value of this template, keyed by its position in "ValueDescs".
+
+        The plan only depends on the template, so it is compiled once per class.
+        """
+        plan = EmuCoordinator._parse_plans.get(type(self))
+        if plan is None:
+            plan = EmuCoordinator._parse_plans[type(self)] = {
+                sensor["position"]: ValueParsePlan(
+                    name=sensor["name"],
+                    # Water must be m³ for Home Assistant, but will most likely come in as 'm^3',
+                    # so we are a bit more lenient there
+                    accepted_units=(
+                        frozenset({sensor["unit_str"], "m^3"})
+                        if sensor["description_str"] == "Volume"
+                        else frozenset({sensor["unit_str"]})
+                    ),
+                    description_str=sensor["description_str"],
+                    has_scaling_factor=sensor["has_scaling_factor"],
+                    sensor_class=sensor["sensor_class"],
+                )
+                for sensor in self._sensors
+            }
+        return plan
+
+    def parse(self, data: list[dict]) -> Mapping[str, EmuReading]:
+        """Parse the "ValueDescs" part of the Output of the API to a Dict, matching the correct values.
+
+        The result maps each sensor name to its reading and is read-only, as it is
+        shared by all entities of the meter.
+        """
+        plan = self.parse_plan
+        parsed = MappingProxyType(
+            {
+                value_plan.name: self._extract_values(item=item, value_plan=value_plan)
+                for item in data
+                if (value_plan := plan.get(item["Position"])) is not None
+            }
+        )
+        if len(parsed) != len(plan):
+            found = {item["Position"] for item in data}
+            missing = [
+                value_plan.name
+                for position, value_plan in plan.items()
+                if position not in found
+            ]
+            raise ValueError(
+                f"Did not find the positions for {', '.join(missing)} in the JSON "
+                "response from the M-Bus Center"
             )
-            for sensor in self._sensors
-        ]
+        return parsed
 
     @staticmethod
-    def _extract_values(
-        data: list[dict],
-        position: int,
-        name: str,
-        has_scaling_factor: bool,
-        unit_str: str,
-        description_str: str | None,
-    ) -> dict:
+    def _extract_values(item: dict, value_plan: ValueParsePlan) -> EmuReading:
         """Extract the values from the dict in the API response."""
-        item = next(item for item in data if item["Position"] == position)
         # test if we found the right entry.
-        # Water must be for Home assistant, but will most likely come in as 'm^3', so we are a bit more lenient there
         if not (
-            (
-                item.get("UnitStr") == unit_str
-                or (item.get("UnitStr") == "m^3" and description_str == "Volume")
+            item.get("UnitStr") in value_plan.accepted_units
+            and (
+                value_plan.description_str is None
+                or item["DescriptionStr"] == value_plan.description_str
             )
-            and (description_str is None or item["DescriptionStr"] == description_str)
         ):
             raise ValueError(
-                f"Did not find the required Fields for {name} in the JSON response from the "
+                f"Did not find the required Fields for {value_plan.name} in the JSON response from the "
                 "M-Bus Center"
             )
-        result = {
-            "name": name,
-            "value": float(item["LoggerLastValue"]),
+        value = float(item["LoggerLastValue"]) / value_plan.scaling_factor(item)
+        attributes = {
             SCALE_POWER: float(item.get("ScalePower")),
             SCALE_MANTISSA: int(item.get("ScaleMantissa")),
             TARIFF: int(item.get("Tariff")),
@@ -423,23 +603,17 @@ class EmuCoordinator(DataUpdateCoordinator, metaclass=abc.ABCMeta):
             CFG_TARIFF: int(item.get("CfgTariff")),
             TIMESTAMP: int(item.get("Values")[0].get("Timestamp")),
         }
-        if has_scaling_factor:
-            result["value"] = result["value"] / (
-                float(item.get("CfgFactor", 1)) if item.get("CfgFactor", 1) != 0 else 1
-            )
-        return result
+        return EmuReading(value=value, attributes=MappingProxyType(attributes))
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def _async_update_data(self) -> Mapping[str, EmuReading] | None:
         """Fetch data from API endpoint.
 
-        This is the place to pre-process the data to lookup tables
-        so entities can quickly look up their data.
+        Only used when a refresh of a single meter is requested. The meter is read
+        by the EmuCenterCoordinator, which hands its readings over as usual.
         """
 
-        self.update_interval = timedelta(seconds=60)
-
-        async def fetch_all_values() -> dict[str, float]:
-            client = EmuApiClient(ip=self.ip, update_coordinator=self)
-            return await client.read_sensor_async(sensor_id=self._sensor_id)
-
-        return await fetch_all_values()
+        center_data: EmuCenterData = self._hass.data[DOMAIN][self._config_entry_id]
+        await center_data.coordinator.async_refresh_meter(self)
+        if self.data is None:
+            raise UpdateFailed(f"Could not read {self.name}")
+        return self.data
@@ -0,0 +1,133 @@
+"""Import the sample history logged by the M-Bus Center into long-term statistics."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .sensor import EmuCoordinator, ValueParsePlan
+
+_LOGGER = logging.getLogger(__name__)
+
+_HOUR = 3600
+
+
+class EmuStatisticsImporter:
+    """Backfill the counters of the meters with the samples kept by the Center.
+
+    Every "ValueDescs" entry carries a list of timestamped samples. For the
+    counters that only ever increase, the last sample of every completed hour is
+    imported, so outages of Home Assistant or the network leave no holes in the
+    long-term statistics. The counter value is used as the sum, which is why
+    counters that may be reset are left out.
+
+    The hours go into an external statistic per counter, "emu_m_bus_center:" and
+    the slug of serial number and sensor name, not into the statistics of the
+    sensor entity, so users have to pick these statistics, e.g. in the energy
+    dashboard. The hour imported last is remembered per statistic, seeded from
+    the recorder, so only new hours are written.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create a new importer."""
+        self._hass = hass
+        self._high_water: dict[str, float] = {}
+        self.imported_hours = 0
+
+    async def async_import(self, meter: EmuCoordinator, device: dict) -> None:
+        """Import the hours of every counter of the meter that are not known yet."""
+        value_descs = {item["Position"]: item for item in device["ValueDescs"]}
+        now = dt_util.utcnow().timestamp()
+        for position, value_plan in meter.parse_plan.items():
+            if (
+                value_plan.sensor_class._attr_state_class  # noqa: SLF001
+                != SensorStateClass.TOTAL_INCREASING
+                or position not in value_descs
+            ):
+                continue
+            await self._async_import_counter(
+                meter, value_plan, value_descs[position], now
+            )
+
+    async def _async_import_counter(
+        self,
+        meter: EmuCoordinator,
+        value_plan: ValueParsePlan,
+        item: dict,
+        now: float,
+    ) -> None:
+        """Import the completed hours of one counter in a single call."""
+        statistic_id = f"{DOMAIN}:{slugify(f'{meter.serial_no} {value_plan.name}')}"
+        high_water = self._high_water.get(statistic_id)
+        if high_water is None:
+            # Ask the recorder only once, most reads bring no completed hour
+            high_water = await self._async_last_imported_hour(statistic_id)
+            self._high_water[statistic_id] = high_water
+
+        factor = value_plan.scaling_factor(item)
+        hours: dict[float, tuple[float, float]] = {}
+        for sample in item.get("Values") or []:
+            try:
+                timestamp = float(sample["Timestamp"])
+                value = float(sample["Value"]) / factor
+            except (KeyError, TypeError, ValueError):
+                continue
+            hour = timestamp - timestamp % _HOUR
+            # Only completed hours that were not imported yet, keeping the last
+            # sample of each hour
+            if hour <= high_water or hour + _HOUR > now:
+                continue
+            if hour not in hours or timestamp > hours[hour][0]:
+                hours[hour] = (timestamp, value)
+        if not hours:
+            return
+
+        async_add_external_statistics(
+            self._hass,
+            StatisticMetaData(
+                has_mean=False,
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name=f"{meter.name} {value_plan.name}",
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_of_measurement=value_plan.sensor_class._attr_native_unit_of_measurement,  # noqa: SLF001
+            ),
+            [
+                StatisticData(
+                    start=datetime.fromtimestamp(hour, dt_util.UTC),
+                    state=value,
+                    sum=value,
+                )
+                for hour, (_, value) in sorted(hours.items())
+            ],
+        )
+        self._high_water[statistic_id] = max(hours)
+        self.imported_hours += len(hours)
+        _LOGGER.debug("Imported %i hours into %s", len(hours), statistic_id)
+
+    async def _async_last_imported_hour(self, statistic_id: str) -> float:
+        """Get the start of the last hour the recorder has for the statistic."""
+        last = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics, self._hass, 1, statistic_id, True, {"sum"}
+        )
+        rows = last.get(statistic_id)
+        return float(rows[0]["start"]) if rows else 0.0
@@ -0,0 +1,68 @@
+"""Keep the last readings of the meters across restarts of Home Assistant."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORE_SAVE_DELAY, STORE_VERSION
+
+if TYPE_CHECKING:
+    from .sensor import EmuReading
+
+
+class EmuReadingsStore:
+    """Persist the last parsed readings of every meter of one M-Bus Center.
+
+    Writes are debounced by STORE_SAVE_DELAY seconds, the storage helper flushes
+    pending writes when Home Assistant stops.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Create a new store for the config entry."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORE_VERSION, f"{DOMAIN}.{entry_id}.readings"
+        )
+        self._meters: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the readings saved before the last restart."""
+        self._meters = await self._store.async_load() or {}
+
+    def get(self, sensor_id: int) -> tuple[int | None, dict[str, list]] | None:
+        """Get the saved logger timestamp and readings of a meter, if there are any.
+
+        The readings map each sensor name to its value and state attributes.
+        """
+        meter = self._meters.get(str(sensor_id))
+        if not meter or not meter.get("readings"):
+            return None
+        return meter.get("logger_timestamp"), meter["readings"]
+
+    @callback
+    def async_set(
+        self,
+        sensor_id: int,
+        logger_timestamp: int | None,
+        readings: Mapping[str, EmuReading],
+    ) -> None:
+        """Remember the latest readings of a meter and schedule a save."""
+        self._meters[str(sensor_id)] = {
+            "logger_timestamp": logger_timestamp,
+            "readings": {
+                name: [reading.value, dict(reading.attributes)]
+                for name, reading in readings.items()
+            },
+        }
+        self._store.async_delay_save(lambda: self._meters, STORE_SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        """Write the readings right away, e.g. when the entry is unloaded."""
+        await self._store.async_save(self._meters)
+
+    async def async_remove(self) -> None:
+        """Delete the saved readings of a removed entry."""
+        await self._store.async_remove()